@@ -1,12 +1,14 @@
 """Utility to check Code Complexity."""
 
 import sys
-
-from radon.complexity import cc_visit, cc_rank, sorted_results
+from functools import partial
 
 from compliance_check import Compliance
-from helper_utils import filter_files
-from config import (ERROR_MSG, OKAY_MSG)
+from compliance_daemon import run_check_in_daemon
+from helper_utils import (filter_files, get_cached_results, parallel_map, parse_file)
+from config import (ERROR_MSG, OKAY_MSG, CUT_OFF_CODE_COMPLEXITY)
+
+# 'radon' is imported where it is used, so that handing the check over to the daemon does not pay for it.
 
 
 class CodeComplexity(Compliance):
@@ -36,38 +38,74 @@ class CodeComplexity(Compliance):
         """
         Check code complexity compliance using 'radon'.
 
+        The files are analysed in parallel, re-using the cached analysis for unchanged files,
+        and the worst violation of each file is reported before exiting.
+
         :param files_list: list
             List of files to check for code complexity compliance.
         :return: None
         """
         if files_list:
+            from radon import __version__ as radon_version
+
             files_list = filter_files(files_list)
+            is_violation_found = False
+
+            files_blocks = get_cached_results('radon', radon_version, files_list, _get_code_blocks,
+                                              map_func=partial(parallel_map, chunksize=8))
 
-            for filename in files_list:
+            for filename, blocks in zip(files_list, files_blocks):
                 print("Checking file: {file}".format(file=filename))
-                with open(filename) as fobj:
-                    source = fobj.read()
-                blocks = cc_visit(source)
-                for result in sorted_results(blocks):
-                    try:
-                        component_result = str(result)
-                        cc_rk = cc_rank(int(component_result.split()[-1]))
-                        '''
-                        21 - 30	D (more than moderate risk - more complex block)
-                        31 - 40	E (high risk - complex block, alarming)
-                        41+     F (very high risk - error-prone, unstable block)
-                        '''
-                        if cc_rk in ['D', 'E', 'F']:
-                            error_msg = "Code complexity appears to be high, please re-factor:\n" + ERROR_MSG
-                            print(error_msg + " " + component_result[:-1] + cc_rk)
-                            sys.exit(1)
-                    except ValueError:
-                        pass
-                print("No issues found with code complexity check for: {file} ".format(file=filename) + OKAY_MSG)
+                violation = _get_violation(blocks)
+                if violation is not None:
+                    is_violation_found = True
+                    error_msg = "Code complexity appears to be high, please re-factor:\n" + ERROR_MSG
+                    print(error_msg + " " + violation)
+                else:
+                    print("No issues found with code complexity check for: {file} ".format(file=filename) + OKAY_MSG)
 
+            if is_violation_found:
+                sys.exit(1)
 
-def main():
-    """Main function."""
+
+def _get_code_blocks(filename):
+    """
+    Get the code blocks, along with their complexity, of a single file.
+
+    This is a module level function so that it can be run in a worker process.
+
+    :param filename: str
+        The file to analyse.
+    :return: list
+        The code blocks (functions, methods and classes) found by 'radon'.
+    """
+    from radon.visitors import ComplexityVisitor
+
+    # The parsed tree is shared with the other checks run in the same process, see 'parse_file'.
+    return ComplexityVisitor.from_ast(parse_file(filename)).blocks
+
+
+def _get_violation(blocks):
+    """
+    Get the most complex code block violating the code complexity cut-off from the code blocks of a file.
+
+    :param blocks: list
+        The code blocks found by 'radon'.
+    :return: str
+        The violation found, 'None' if there is none.
+    """
+    from radon.complexity import cc_rank
+
+    result = max((block for block in blocks if block.complexity >= CUT_OFF_CODE_COMPLEXITY),
+                 key=lambda block: block.complexity, default=None)
+    if result is None:
+        return None
+    return "{name} (line {line}) cc={cc} rank={rank}".format(
+            name=result.fullname, line=result.lineno, cc=result.complexity, rank=cc_rank(result.complexity))
+
+
+def run():
+    """Run the code complexity check on the files given on the command line."""
     compliance = CodeComplexity()
     files_list = compliance.get_files_list("Check code complexity compliance using 'radon'.")
 
@@ -76,5 +114,11 @@ def main():
         compliance.check(files_list=files_list)
 
 
+def main():
+    """Main function."""
+    if not run_check_in_daemon('code_complexity'):
+        run()
+
+
 if __name__ == '__main__':
     main()
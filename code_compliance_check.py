@@ -1,9 +1,15 @@
-"""Utility to check code compliance using 'flake8'."""
+"""Utility to check code compliance using 'ruff', 'flake8' or 'pylint'."""
 
 import importlib
+import json
+import shutil
+import subprocess
 import sys
+from functools import lru_cache
+from io import StringIO
 
 from compliance_check import Compliance, ComplianceViolationException
+from compliance_daemon import run_check_in_daemon
 from config import (ERROR_MSG,
                     OKAY_MSG,
                     CODE_COMPLIANCE_IGNORE_LIST,
@@ -31,8 +37,13 @@ class CodeCompliance(Compliance):
         super(CodeCompliance, self).__init__()
         self.validator_to_function_map = {
             "flake8": CodeCompliance._run_flake8_validator,
-            "pylint": CodeCompliance._run_pylint_validator
+            "pylint": CodeCompliance._run_pylint_validator,
+            "ruff": CodeCompliance._run_ruff_validator
         }
+        # Validator name to its module and validation function, looked up once per validator in 'check'.
+        self._dispatch = {name: (CODE_VALIDATOR_TO_MODULE_MAP[name], func)
+                          for name, func in self.validator_to_function_map.items()
+                          if name in CODE_VALIDATOR_TO_MODULE_MAP}
 
     def parse_args(self, description=None):
         """
@@ -43,9 +54,8 @@ class CodeCompliance(Compliance):
         :return: object
         """
         parser = super(CodeCompliance, self).parse_args(description)
+        # 'ruff' is not the default, as it does not implement the continuation line rules ('E12x') of 'flake8'.
         parser.add_argument('--code_validators', nargs='*', default=['flake8'], help='The code validator to use.')
-        args = parser.parse_args()
-        self.code_validators = args.code_validators
 
         return parser
 
@@ -57,28 +67,26 @@ class CodeCompliance(Compliance):
             Description of the program.
         :return: list
         """
-        return super(CodeCompliance, self).get_files_list(description)
+        files_list = super(CodeCompliance, self).get_files_list(description)
+        self.code_validators = self._get_args(description).code_validators
+        return files_list
 
     def check(self, files_list):
         """
-        Check code compliance using 'flake8'.
+        Check code compliance using the selected code validators.
 
         :param files_list: list
             List of files to check for code compliance.
         :return: None
         """
-        if not all(validators in CODE_VALIDATOR_TO_MODULE_MAP for validators in self.code_validators):
+        if not all(validators in self._dispatch for validators in self.code_validators):
             raise ComplianceViolationException('\'{mod}\' not supported currently.'.format(mod=self.code_validators))
 
         # We need this branching since the way the validation is done is different for
         # for different validation utilities.
         for validator in self.code_validators:
-            validator_module = CODE_VALIDATOR_TO_MODULE_MAP.get(validator, None)
-            if validator_module is not None:
-                self.validator_to_function_map[validator](validator_module, files_list)
-            else:
-                raise ComplianceViolationException('The corresponding module for \'{val}\' is \'None\'.'.format(
-                        val=validator))
+            validator_module, validator_func = self._dispatch[validator]
+            validator_func(validator_module, files_list)
 
     @staticmethod
     def _run_flake8_validator(validator_module, files_list):
@@ -91,9 +99,7 @@ class CodeCompliance(Compliance):
             List of files to check for code compliance.
         :return: None
         """
-        flake8 = importlib.import_module(validator_module)
-        style_guide = flake8.get_style_guide(ignore=CODE_COMPLIANCE_IGNORE_LIST)
-        style_guide.options.max_line_length = 120
+        style_guide = _get_flake8_style_guide(validator_module, tuple(CODE_COMPLIANCE_IGNORE_LIST), 120)
         report = style_guide.check_files(files_list)
         if report.total_errors > 0:
             error_msg = ERROR_MSG + " Found code compliance violations!"
@@ -102,6 +108,52 @@ class CodeCompliance(Compliance):
         else:
             print("All files have passed code compliance check. " + OKAY_MSG)
 
+    @staticmethod
+    def _run_ruff_validator(validator_module, files_list):
+        """
+        Check code compliance using 'ruff'.
+
+        Falls back to 'flake8' when the 'ruff' executable is not installed.
+
+        :param validator_module: str
+            Always 'None', since 'ruff' is run as an external executable.
+        :param files_list: list
+            List of files to check for code compliance.
+        :return: None
+        """
+        ruff = shutil.which('ruff')
+        if ruff is None:
+            print("Could not find 'ruff', falling back to 'flake8' ...")
+            CodeCompliance._run_flake8_validator(CODE_VALIDATOR_TO_MODULE_MAP['flake8'], files_list)
+            return
+
+        # Most of the pycodestyle 'E1', 'E2' and 'E3' rules are only available in the preview mode of 'ruff'.
+        ruff_cmd = [ruff, 'check',
+                    '--preview',
+                    '--output-format=json',
+                    '--select=E,F,W',
+                    '--ignore=' + ','.join(CODE_COMPLIANCE_IGNORE_LIST),
+                    '--line-length=120']
+        ruff_cmd.extend(files_list)
+        ruff_out = subprocess.run(ruff_cmd, stdout=subprocess.PIPE)
+        # Exit code 1 just means that violations were found, anything above is an error running 'ruff' itself.
+        if ruff_out.returncode > 1:
+            error_msg = ERROR_MSG + " Could not run 'ruff', exit code: {code}".format(code=ruff_out.returncode)
+            print(error_msg)
+            sys.exit(1)
+
+        violations = json.loads(ruff_out.stdout.decode('utf-8') or '[]')
+        if violations:
+            for violation in violations:
+                print('{file}:{row}:{col}: {code} {message}'.format(
+                        file=violation['filename'], row=violation['location']['row'],
+                        col=violation['location']['column'], code=violation['code'], message=violation['message']))
+            error_msg = ERROR_MSG + " Found code compliance violations!"
+            print(error_msg)
+            sys.exit(1)
+        else:
+            print("All files have passed code compliance check. " + OKAY_MSG)
+
     @staticmethod
     def _run_pylint_validator(validator_module, files_list):
         """
@@ -113,25 +165,65 @@ class CodeCompliance(Compliance):
             List of files to check for code compliance.
         :return: None
         """
-        lint = importlib.import_module(validator_module)
-        error_report = set()
-
-        for fileName in files_list:
-            (pylint_out, pylint_err) = lint.py_run(fileName, return_std=True)
-            errors = [output for output in pylint_out.readlines() if ': error ' in output]
-            if pylint_err or errors:
-                error_report.add('\n'.join(errors))
+        lint = load_validator(validator_module)
+        from pylint.reporters import JSONReporter
+
+        # A single in-process run over all the files, so that the start up cost is paid only once.
+        pylint_out = StringIO()
+        lint.Run(list(files_list), reporter=JSONReporter(pylint_out), exit=False)
+        # Keep the errors in the order reported by 'pylint', i.e. grouped by file, and join them only once.
+        error_report = ['{path}:{line}: {type} ({id}, {symbol}, {obj}) {message}'.format(
+                path=message['path'], line=message['line'], type=message['type'],
+                id=message['message-id'], symbol=message['symbol'], obj=message['obj'],
+                message=message['message'])
+                for message in json.loads(pylint_out.getvalue() or '[]')
+                if message['type'] in ('error', 'fatal')]
 
         if error_report:
             error_msg = ERROR_MSG + " Found code compliance violations!"
-            print("\n" + error_msg + "\n".join(error_report))
+            print("\n" + error_msg + "\n" + "\n".join(error_report))
             sys.exit(1)
         else:
             print("All files have passed code compliance check. " + OKAY_MSG)
 
 
-def main():
-    """Main function."""
+@lru_cache(maxsize=None)
+def load_validator(validator_module):
+    """
+    Load the Python module of a validator, once per process.
+
+    :param validator_module: str
+        Fully qualified name of the Python module of the validator.
+    :return: object
+        Loaded module object.
+    """
+    return importlib.import_module(validator_module)
+
+
+@lru_cache(maxsize=None)
+def _get_flake8_style_guide(validator_module, ignore_list, max_line_length):
+    """
+    Get a 'flake8' style guide, re-using the one created by an earlier check with the same options.
+
+    The style guide holds the 'flake8' configuration found from the working directory, so the daemon
+    clears this cache before every request.
+
+    :param validator_module: str
+        Fully qualified name of the Python module of the validator.
+    :param ignore_list: tuple
+        The violation codes to ignore.
+    :param max_line_length: int
+        The maximum allowed line length.
+    :return: object
+    """
+    flake8 = load_validator(validator_module)
+    # The options are passed to 'get_style_guide' so that they are in place before it builds the file checker
+    # manager. The number of jobs is left at the 'auto' default, which already runs a process per CPU core.
+    return flake8.get_style_guide(ignore=list(ignore_list), max_line_length=max_line_length)
+
+
+def run():
+    """Run the code compliance check on the files given on the command line."""
     compliance = CodeCompliance()
     files_list = compliance.get_files_list("Check code compliance.")
 
@@ -142,5 +234,11 @@ def main():
         compliance.check(files_list=files_list)
 
 
+def main():
+    """Main function."""
+    if not run_check_in_daemon('code_compliance'):
+        run()
+
+
 if __name__ == '__main__':
     main()
@@ -1,16 +1,16 @@
 """Abstract class for all compliance checking operations."""
 import argparse
 from abc import ABCMeta, abstractmethod
-from six import add_metaclass
 from helper_utils import (get_files_to_be_committed, get_diff_between_branches)
 
 
-@add_metaclass(ABCMeta)
-class Compliance(object):
+class Compliance(metaclass=ABCMeta):
     """Abstract class for all compliance checking operations."""
 
     def __init__(self):
-    	self._parser = None
+        """Initialization method."""
+        self._parser = None
+        self._args = None
 
     @abstractmethod
     def parse_args(self, description=None):
@@ -52,8 +52,7 @@ class Compliance(object):
         :return: list
         """
         files_list = []
-        args_parser = self.parse_args(description=description)
-        args = args_parser.parse_args()
+        args = self._get_args(description=description)
 
         if args.pre_commit_check:
             files_list = get_files_to_be_committed()
@@ -67,6 +66,18 @@ class Compliance(object):
 
         return files_list
 
+    def _get_args(self, description=None):
+        """
+        Get the parsed command line arguments, parsing them only on the first call.
+
+        :param description: str
+            Description of the program.
+        :return: object
+        """
+        if self._args is None:
+            self._args = self.parse_args(description=description).parse_args()
+        return self._args
+
     @abstractmethod
     def check(self, files_list):
         """
@@ -0,0 +1,476 @@
+"""Daemon which runs the compliance checks in an already warmed up interpreter."""
+
+import argparse
+import hashlib
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import sysconfig
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+import helper_utils
+
+from config import (
+    CACHE_DIR,
+    CODE_VALIDATOR_TO_MODULE_MAP,
+    DAEMON_IDLE_TIMEOUT,
+    DAEMON_PID_FILE,
+    DAEMON_PRELOAD_MODULES,
+    DAEMON_REQUEST_TIMEOUT,
+    DAEMON_SOCKET_PATH,
+    DAEMON_START_TIMEOUT,
+    NO_DAEMON_ENV_VAR)
+
+# Tool name to the module running the compliance check, through its 'run' function.
+COMPLIANCE_TOOLS = {
+    'code_complexity': 'code_complexity_check',
+    'code_compliance': 'code_compliance_check',
+    'doc_compliance': 'doc_compliance_check',
+    'design_compliance': 'design_compliance_check'
+}
+
+# Modules of this package, which the daemon keeps loaded along with the compliance checks.
+PACKAGE_MODULES = ['compliance_check', 'compliance_daemon', 'config', 'helper_utils']
+
+
+def run_check_in_daemon(tool):
+    """
+    Run a compliance check, with the command line arguments of this process, through the daemon.
+
+    The daemon is started if it is not running. The arguments are parsed and the files to check
+    are looked up in the daemon, so the client does not pay for anything but connecting to it.
+    The output of the check is printed and the process exits with the exit code of the check
+    when it fails, just like when the check is run in-process.
+
+    :param tool: str
+        Name of the compliance check, one of the keys of 'COMPLIANCE_TOOLS'.
+    :return: boolean
+        'False' if the daemon could not be used and the check has to be run in-process.
+    """
+    if os.getenv(NO_DAEMON_ENV_VAR) or not hasattr(socket, 'AF_UNIX'):
+        return False
+
+    request = {'tool': tool,
+               'argv': sys.argv[1:],
+               'cwd': os.getcwd(),
+               'env': dict(os.environ),
+               'fingerprint': get_fingerprint()}
+    response = _send_request(request)
+    if response is None:
+        return False
+
+    sys.stdout.write(response['output'])
+    sys.stderr.write(response['error'])
+    if response['exit_code']:
+        sys.exit(response['exit_code'])
+    return True
+
+
+def get_fingerprint():
+    """
+    Get a digest of the interpreter, the installed packages and the modules which the daemon keeps loaded.
+
+    A daemon only serves the clients with the same digest as its own at start up, so it is
+    restarted after for e.g. editing a compliance check, installing or upgrading a package
+    (which changes the modification time of the 'site-packages' directory) or switching to
+    another virtual environment. The rest of the import path is left out, as it depends on
+    how the client is started, for e.g. with 'python -m' from another directory.
+
+    :return: str
+    """
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    module_files = [os.path.join(module_dir, module_name + '.py')
+                    for module_name in PACKAGE_MODULES + list(COMPLIANCE_TOOLS.values())]
+    library_dirs = sorted({sysconfig.get_paths()[name] for name in ('purelib', 'platlib')})
+    stamps = [sys.executable, sys.version, module_dir, library_dirs]
+    for path in library_dirs + module_files:
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return hashlib.sha256(json.dumps(stamps).encode('utf-8')).hexdigest()
+
+
+def _send_request(request):
+    """
+    Send a request to the daemon, starting the daemon if required.
+
+    A daemon which does not match the client, see 'get_fingerprint', exits and a new one is started.
+
+    :param request: dict
+        The check request.
+    :return: dict
+        The response from the daemon, 'None' if the daemon could not be reached.
+    """
+    try:
+        response = _request_daemon(request)
+        if not response.get('restart'):
+            return response
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass
+    except OSError:
+        return None
+
+    _start_daemon()
+    deadline = time.time() + DAEMON_START_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(0.1)
+        try:
+            response = _request_daemon(request)
+        except (ConnectionRefusedError, FileNotFoundError):
+            continue
+        except OSError:
+            return None
+        # Even a new daemon does not match, for e.g. when the files keep changing, so run in-process.
+        return None if response.get('restart') else response
+    return None
+
+
+def _request_daemon(request):
+    """
+    Send a request to the running daemon and wait for its response.
+
+    :param request: dict
+        The check request.
+    :return: dict
+        The response from the daemon.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(DAEMON_SOCKET_PATH)
+        client.sendall(json.dumps(request).encode('utf-8'))
+        client.shutdown(socket.SHUT_WR)
+        return json.loads(_receive_all(client).decode('utf-8'))
+
+
+def _receive_all(connection):
+    """
+    Read from a socket until the other end is done writing.
+
+    :param connection: object
+        The connected socket.
+    :return: bytes
+    """
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def _read_request(connection):
+    """
+    Read a check request sent by a client.
+
+    :param connection: object
+        The connected socket.
+    :return: dict
+        The check request.
+    :raises ValueError: if the request is not valid.
+    """
+    request = json.loads(_receive_all(connection).decode('utf-8'))
+    if not isinstance(request, dict) or request.get('tool') not in COMPLIANCE_TOOLS or \
+            not isinstance(request.get('argv'), list) or not isinstance(request.get('cwd'), str) or \
+            not isinstance(request.get('env'), dict):
+        raise ValueError("Invalid compliance check request.")
+    return request
+
+
+def _send_response(connection, response):
+    """
+    Send a response to a client, ignoring a client which went away or does not read it.
+
+    :param connection: object
+        The connected socket.
+    :param response: dict
+        The response.
+    :return: None
+    """
+    try:
+        connection.sendall(json.dumps(response).encode('utf-8'))
+    except OSError:
+        pass
+
+
+def _start_daemon():
+    """
+    Start the daemon in the background, detached from the current session.
+
+    :return: None
+    """
+    subprocess.Popen([sys.executable, os.path.abspath(__file__)],
+                     stdin=subprocess.DEVNULL,
+                     stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+
+
+def _handle_request(request):
+    """
+    Run the compliance check of a request, capturing its output and exit code.
+
+    :param request: dict
+        The check request.
+    :return: dict
+        The output, the error output and the exit code of the check.
+    """
+    # Some validators, for e.g. 'flake8', write the encoded output to 'sys.stdout.buffer' directly.
+    output = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', write_through=True)
+    error = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', write_through=True)
+    exit_code = 0
+    cwd = os.getcwd()
+    argv = sys.argv
+    path = sys.path[:]
+    environ = dict(os.environ)
+    module_names = set(sys.modules)
+    try:
+        os.chdir(request['cwd'])
+        # The checks run with the environment of the client, for e.g. its 'PATH' and 'COMPLIANCE_NO_CACHE'.
+        os.environ.clear()
+        os.environ.update(request['env'])
+        # The cached Git details, executables and 'flake8' configuration belong to the directory
+        # and 'PATH' of the previous request.
+        helper_utils._invalidate_git_cache()
+        helper_utils._resolve_executable.cache_clear()
+        code_compliance_check = sys.modules.get('code_compliance_check')
+        if code_compliance_check is not None:
+            code_compliance_check._get_flake8_style_guide.cache_clear()
+        module = importlib.import_module(COMPLIANCE_TOOLS[request['tool']])
+        sys.argv = [module.__file__] + request['argv']
+        with redirect_stdout(output), redirect_stderr(error):
+            module.run()
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            exit_code = exc.code or 0
+        else:
+            error.write(str(exc.code) + '\n')
+            exit_code = 1
+    except Exception:
+        error.write(traceback.format_exc())
+        exit_code = 1
+    finally:
+        os.chdir(cwd)
+        sys.argv = argv
+        sys.path[:] = path
+        os.environ.clear()
+        os.environ.update(environ)
+        _forget_project_modules(module_names, request['cwd'])
+    return {'output': output.buffer.getvalue().decode('utf-8', errors='replace'),
+            'error': error.buffer.getvalue().decode('utf-8', errors='replace'),
+            'exit_code': exit_code}
+
+
+def _forget_project_modules(module_names, project_dir):
+    """
+    Forget the modules which a request imported from its project, for e.g. the design check plugins.
+
+    The next request imports them again, so that it sees their changes. The installed libraries
+    are kept, even when the virtual environment is inside the project.
+
+    :param module_names: set
+        Names of the modules imported before the request.
+    :param project_dir: str
+        The working directory of the request.
+    :return: None
+    """
+    project_dir = os.path.abspath(project_dir)
+    library_dirs = {os.path.abspath(sysconfig.get_paths()[name]) for name in ('stdlib', 'purelib', 'platlib')}
+    for module_name in set(sys.modules) - module_names:
+        file_name = getattr(sys.modules[module_name], '__file__', None)
+        if file_name is None:
+            continue
+        file_name = os.path.abspath(file_name)
+        if _is_path_under(file_name, project_dir) and \
+                not any(_is_path_under(file_name, library_dir) for library_dir in library_dirs):
+            del sys.modules[module_name]
+
+
+def _is_path_under(path, directory):
+    """
+    Check whether a path is inside a directory.
+
+    :param path: str
+        Absolute path.
+    :param directory: str
+        Absolute path of the directory.
+    :return: boolean
+    """
+    return os.path.commonpath([path, directory]) == directory
+
+
+def _read_pid():
+    """
+    Get the process id of the running daemon.
+
+    :return: int
+        The process id, 'None' if the daemon is not running.
+    """
+    try:
+        with open(DAEMON_PID_FILE) as fobj:
+            pid = int(fobj.read().strip())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+
+def _is_daemon_listening():
+    """
+    Check whether a daemon is already accepting connections on the socket.
+
+    :return: boolean
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(DAEMON_SOCKET_PATH)
+        except OSError:
+            return False
+    return True
+
+
+def _pre_import_modules():
+    """
+    Import the compliance checks and load their validators, so that the requests do not pay for it.
+
+    :return: None
+    """
+    for module_name in list(COMPLIANCE_TOOLS.values()) + DAEMON_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+    code_compliance_check = sys.modules.get('code_compliance_check')
+    if code_compliance_check is not None:
+        for validator_module in CODE_VALIDATOR_TO_MODULE_MAP.values():
+            if validator_module is None:
+                continue
+            try:
+                code_compliance_check.load_validator(validator_module)
+            except ImportError:
+                pass
+
+
+def _terminate(signum, frame):
+    """
+    Signal handler to shut the daemon down cleanly.
+
+    :param signum: int
+        The signal number.
+    :param frame: object
+        The current stack frame.
+    :return: None
+    """
+    sys.exit(0)
+
+
+def serve(idle_timeout=DAEMON_IDLE_TIMEOUT):
+    """
+    Serve compliance check requests until no request arrives for 'idle_timeout' seconds.
+
+    The daemon also exits when a client does not match it, see 'get_fingerprint'. A client which
+    sends a broken request, goes away or stalls for 'DAEMON_REQUEST_TIMEOUT' seconds only loses
+    its own request. The socket is only accessible to the owner of the daemon, as the requests
+    run with their own environment as that user.
+
+    :param idle_timeout: int
+        Number of idle seconds after which the daemon exits.
+    :return: None
+    """
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    if _is_daemon_listening():
+        return
+    if os.path.exists(DAEMON_SOCKET_PATH):
+        os.remove(DAEMON_SOCKET_PATH)
+
+    fingerprint = get_fingerprint()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o077)
+    try:
+        server.bind(DAEMON_SOCKET_PATH)
+    finally:
+        os.umask(umask)
+    server.listen()
+    server.settimeout(idle_timeout)
+    with open(DAEMON_PID_FILE, 'w') as fobj:
+        fobj.write(str(os.getpid()))
+
+    is_listening = True
+    is_pre_imported = False
+    try:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                break
+            with connection:
+                connection.settimeout(DAEMON_REQUEST_TIMEOUT)
+                try:
+                    request = _read_request(connection)
+                except (ValueError, OSError):
+                    continue
+                if request.get('fingerprint') != fingerprint:
+                    # Free the socket before answering, so that the client can start the new daemon right away.
+                    _stop_listening(server)
+                    is_listening = False
+                    _send_response(connection, {'restart': True})
+                    break
+                # The heavy imports are only done once a client is known to match, so that a daemon
+                # which is restarted right away does not pay for them.
+                if not is_pre_imported:
+                    _pre_import_modules()
+                    is_pre_imported = True
+                _send_response(connection, _handle_request(request))
+    finally:
+        if is_listening:
+            _stop_listening(server)
+
+
+def _stop_listening(server):
+    """
+    Close the server socket and remove the socket and the pid files.
+
+    :param server: object
+        The listening socket.
+    :return: None
+    """
+    server.close()
+    for file_name in (DAEMON_SOCKET_PATH, DAEMON_PID_FILE):
+        if os.path.exists(file_name):
+            os.remove(file_name)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Daemon running the compliance checks in a warm interpreter.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--stop", action="store_true", help="Stop the running daemon.")
+    group.add_argument("--status", action="store_true", help="Show whether the daemon is running.")
+    args = parser.parse_args()
+
+    pid = _read_pid()
+    if args.status:
+        if pid is None:
+            print("The compliance daemon is not running.")
+        else:
+            print("The compliance daemon is running with pid {pid}.".format(pid=pid))
+    elif args.stop:
+        if pid is None:
+            print("The compliance daemon is not running.")
+        else:
+            os.kill(pid, signal.SIGTERM)
+            print("Stopped the compliance daemon with pid {pid}.".format(pid=pid))
+    else:
+        signal.signal(signal.SIGTERM, _terminate)
+        serve()
+
+
+if __name__ == '__main__':
+    main()
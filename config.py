@@ -1,5 +1,7 @@
 """Configuration file for build/utilities."""
 
+import os
+
 from colorama import Fore, Style
 
 # Check mark character
@@ -23,16 +25,54 @@ IGNORE_LIST = ('tests', 'unit_tests', 'samples', 'templates', 'images', 'docs')
 # The cut-off for code coverage percentage. Anything below this will be flagged.
 CUT_OFF_CODE_COVERAGE_PCT = 80
 
+# The cut-off for code complexity. Anything from rank 'D' (21 - 30, more than moderate risk) upwards,
+# i.e. 'E' (31 - 40, high risk) and 'F' (41+, very high risk), will be flagged.
+CUT_OFF_CODE_COMPLEXITY = 21
+
 # Ignore list for 'flake8' compliance violation codes
 CODE_COMPLIANCE_IGNORE_LIST = ['F405', 'E731']
 
+# Number of files checked by a single 'pydocstyle' worker.
+DOC_COMPLIANCE_BATCH_SIZE = 200
+
+# Imported modules and function calls which indicate that debugging is enabled in a file.
+DEBUG_IMPORT_TOKENS = frozenset({'ipdb', 'pdb'})
+DEBUG_CALL_TOKENS = frozenset({'ipdb.set_trace', 'pdb.set_trace', 'print'})
+
 # Compliance check plugins' folder name
 COMPLIANCE_CHECK_PLUGINS_FOLDER = 'compliance_check_plugins'
 
+# Directory for the on-disk cache of analysis results.
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'compliance_utils')
+
+# Environment variable which, when set, disables the caching of analysis results.
+NO_CACHE_ENV_VAR = 'COMPLIANCE_NO_CACHE'
+
+# Unix socket and pid file of the compliance check daemon.
+DAEMON_SOCKET_PATH = os.path.join(CACHE_DIR, 'daemon.sock')
+DAEMON_PID_FILE = os.path.join(CACHE_DIR, 'daemon.pid')
+
+# Number of seconds without any request after which the daemon exits.
+DAEMON_IDLE_TIMEOUT = 300
+
+# Number of seconds to wait for a newly started daemon to accept connections.
+DAEMON_START_TIMEOUT = 5
+
+# Number of seconds the daemon waits on a client reading a request from it or writing a response to it.
+DAEMON_REQUEST_TIMEOUT = 10
+
+# Modules which the checks import on first use, imported by the daemon when it starts.
+DAEMON_PRELOAD_MODULES = ['radon.complexity', 'radon.visitors', 'pydocstyle']
+
+# Environment variable which, when set, runs the checks in-process instead of through the daemon.
+NO_DAEMON_ENV_VAR = 'COMPLIANCE_NO_DAEMON'
+
 # Filter for git diff
 GIT_DIFF_FILTER = 'ACMRTUXB'
 
+# Code validator to the Python module implementing it, 'None' for validators run as an external executable.
 CODE_VALIDATOR_TO_MODULE_MAP = {
     'flake8': 'flake8.api.legacy',
-    'pylint': 'pylint.epylint'
+    'pylint': 'pylint.lint',
+    'ruff': None
 }
@@ -2,12 +2,18 @@
 
 import argparse
 import os
+import re
+import subprocess
 import sys
+import tempfile
 
 import config as cfg
 import helper_utils as helper
 from compliance_check import Compliance
 
+# A line of the coverage report, capturing the file name (first column) and the coverage % (last column).
+COVERAGE_LINE_REGEX = re.compile(rb'^(\S+)\s.*\s(\d+%)\s*$', re.MULTILINE)
+
 
 class CoverageCheckCompliance(Compliance):
     """Class to handle the check for coverage."""
@@ -39,7 +45,7 @@ class CoverageCheckCompliance(Compliance):
 
         :return: object
         """
-        return self._parser.parse_args()
+        return self._get_args()
 
     def check(self, files_list):
         """
@@ -60,13 +66,12 @@ class CoverageCheckCompliance(Compliance):
         :return: list
         """
         files_list = []
-        args_parser = self.parse_args(description=description)
-        args = args_parser.parse_args()
+        args = self._get_args(description=description)
 
         if args.pre_merge_coverage_check:
             files_list = helper.get_diff_between_branches(
-                    args.preMergeCoverageCheck[0],
-                    args.preMergeCoverageCheck[1]
+                    args.pre_merge_coverage_check[0],
+                    args.pre_merge_coverage_check[1]
             )
         else:
             files_list = helper.get_files_to_be_committed()
@@ -86,40 +91,44 @@ class CoverageCheckCompliance(Compliance):
         :return: None
         """
         change_set = helper.filter_files(files_list)
+        ignore_list = frozenset(cfg.IGNORE_LIST)
         file_to_coverage_pct_map = dict()
+        files_to_check = set()
         # Use a 'set' to reduce the coverage check execution time.
         coverage_dir_set = set()
 
+        # Instead of looping through each parent directory of the file, check coverage only once for the parent
+        # directory. For e.g., suppose the files to check coverage are 'tmpdir/a.py' and 'tmpdir/b.py', instead of
+        # executing the coverage check twice, check only once since the parent directory remains the same.
         for file_name in change_set:
             coverage_dir = os.path.dirname(file_name)
-            # Instead of looping through each parent directory of the file, check coverage only once for the parent
-            # directory. For e.g., suppose the files to check coverage are 'tmpdir/a.py' and 'tmpdir/b.py', instead of
-            # executing the coverage check twice, check only once since the parent directory remains the same.
-            coverage_dir_set.add(coverage_dir)
+            if os.path.basename(coverage_dir) not in ignore_list:
+                files_to_check.add(file_name)
+                coverage_dir_set.add(coverage_dir)
 
         for coverage_dir in coverage_dir_set:
             print("Checking in %s" % coverage_dir)
-            file_to_coverage_pct_map.update(CoverageCheckCompliance.get_coverage(coverage_dir))
+        # The coverage runs are independent subprocesses, so run them concurrently from threads.
+        for coverage_map in helper.parallel_map(CoverageCheckCompliance.get_coverage, coverage_dir_set,
+                                                is_threaded=True):
+            file_to_coverage_pct_map.update(coverage_map)
 
         files_missing_coverage = set()
 
         # Check the files for their coverage.
-        for file_name in change_set:
-            file_dir_name = os.path.dirname(file_name)
-            if file_dir_name.split('/')[-1] in cfg.IGNORE_LIST:
+        for file_name, coverage in file_to_coverage_pct_map.items():
+            if file_name not in files_to_check:
                 continue
-
-            if file_name in file_to_coverage_pct_map:
-                try:
-                    coverage_pct = int(file_to_coverage_pct_map[file_name][:-1])
-                except ValueError:
-                    print("ERROR: Could not get the correct coverage percentage for {fn}".format(fn=file_name))
-                else:
-                    if coverage_pct < cfg.CUT_OFF_CODE_COVERAGE_PCT:
-                        error_msg = cfg.ERROR_MSG + " WARNING: Coverage for {fn} is at {pct} only!".format(
-                                fn=file_name, pct=file_to_coverage_pct_map[file_name])
-                        print(error_msg)
-                        files_missing_coverage.add(file_name + " -> " + file_to_coverage_pct_map[file_name])
+            try:
+                coverage_pct = int(coverage.rstrip('%'))
+            except ValueError:
+                print("ERROR: Could not get the correct coverage percentage for {fn}".format(fn=file_name))
+            else:
+                if coverage_pct < cfg.CUT_OFF_CODE_COVERAGE_PCT:
+                    error_msg = cfg.ERROR_MSG + " WARNING: Coverage for {fn} is at {pct} only!".format(
+                            fn=file_name, pct=coverage)
+                    print(error_msg)
+                    files_missing_coverage.add(file_name + " -> " + coverage)
         if files_missing_coverage:
             error_msg = cfg.ERROR_MSG + " The below files are missing expected coverage:\n"
             print("\n" + error_msg + "\n".join(files_missing_coverage))
@@ -139,14 +148,15 @@ class CoverageCheckCompliance(Compliance):
         # We are only interested in the coverage report.
         coverage_cmd = ["pytest", "-qs", coverage_dir, "--cov=" + coverage_dir, "--cov-report=term:skip-covered"]
         # Skip those which have 100% coverage already.
-        # The 'Coverage.py' gives a warning about no files being collected and on Python 3
-        # 'subprocess.check_returncode()' throws an exception. We want the coverage report to get the data from.
-        cmd_output_list = helper.execute_shell_command(command=coverage_cmd, is_check_for_exit_code=False)
-        # Create a list from those lines which have a '%' (i.e. the coverage)
-        coverage_list = [output for output in cmd_output_list if '%' in output]
-        # Get the first and last columns (i.e., file name and coverage %) from each list element.
-        file_to_coverage_pct_map = dict((item.split()[0], item.split()[-1])
-                                        for item in coverage_list)
+        # The 'Coverage.py' gives a warning about no files being collected, so the exit code is not checked.
+        # We want the coverage report to get the data from.
+        # Every run gets its own coverage data file, since the runs can happen concurrently from the same directory.
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = dict(os.environ, COVERAGE_FILE=os.path.join(data_dir, '.coverage'))
+            cmd = subprocess.run(coverage_cmd, stdout=subprocess.PIPE, env=env)
+        # Get the file name and coverage % from the report lines in a single scan of the raw output.
+        file_to_coverage_pct_map = dict((match.group(1).decode('utf-8'), match.group(2).decode('utf-8'))
+                                        for match in COVERAGE_LINE_REGEX.finditer(cmd.stdout))
         return file_to_coverage_pct_map
 
 
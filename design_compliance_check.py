@@ -1,17 +1,26 @@
 """Design compliance utility."""
 
 import inspect
+import os
+import platform
 import sys
+from functools import partial
 
 from compliance_check import Compliance
+from compliance_daemon import run_check_in_daemon
 from config import (
+    DEBUG_CALL_TOKENS,
+    DEBUG_IMPORT_TOKENS,
     OKAY_MSG,
     ERROR_MSG)
 from helper_utils import (
+    SCAN_FILE_VERSION,
+    get_cached_results,
     get_plugins,
     load_plugin,
-    get_function_calls_from_file,
-    get_imported_modules_from_file)
+    parallel_map,
+    resolve_scanned_file,
+    scan_file)
 
 
 class RegisterDict(dict):
@@ -67,8 +76,6 @@ class DesignCompliance(Compliance):
                 '--check_type',
                 default=['module', 'function', 'class'],
                 help='The type of checks (module, function, class)')
-        args = parser.parse_args()
-        self.check_types = args.check_type
         return parser
 
     def get_files_list(self, description=None):
@@ -79,7 +86,9 @@ class DesignCompliance(Compliance):
             Description of the program.
         :return: list
         """
-        return super(DesignCompliance, self).get_files_list(description)
+        files_list = super(DesignCompliance, self).get_files_list(description)
+        self.check_types = self._get_args(description).check_type
+        return files_list
 
     def check(self, files_list):
         """
@@ -101,9 +110,13 @@ class DesignCompliance(Compliance):
             List of files to check.
         :return: None
         """
-        for file_name in files_list:
-            imported_modules = get_imported_modules_from_file(file_name=file_name)
-            function_calls = get_function_calls_from_file(file_name=file_name)
+        # The scans come from the 'ast' module, so they only change along with the Python version and their format.
+        version = '{python}-{scan}'.format(python=platform.python_version(), scan=SCAN_FILE_VERSION)
+        scanned_files = get_cached_results('scan_file', version, files_list, scan_file,
+                                           map_func=partial(parallel_map, chunksize=8))
+
+        for file_name, scanned_file in zip(files_list, scanned_files):
+            imported_modules, function_calls = resolve_scanned_file(scanned_file)
             kwargs = {'file_name': file_name,
                       'imported_modules': imported_modules,
                       'function_calls': function_calls}
@@ -137,21 +150,12 @@ class DesignCompliance(Compliance):
         file_name = kwargs['file_name']
         imported_modules = kwargs['imported_modules']
         function_calls = kwargs['function_calls']
-        files_with_debugging_enabled = set()
 
-        if 'ipdb' in imported_modules or 'pdb' in imported_modules or \
-                'ipdb.set_trace' in function_calls or 'pdb.set_trace' in function_calls:
-            files_with_debugging_enabled.add(file_name)
-            error_msg = ERROR_MSG + " {file} has debugging enabled!".format(file=file_name)
-            print(error_msg)
-        if 'print' in function_calls:
-            files_with_debugging_enabled.add(file_name)
-            error_msg = ERROR_MSG + " {file} contains print statements!".format(file=file_name)
+        debug_tokens = (imported_modules & DEBUG_IMPORT_TOKENS) | (function_calls & DEBUG_CALL_TOKENS)
+        if debug_tokens:
+            error_msg = ERROR_MSG + " Debug statements and/or print statements found in {file}: {tokens}".format(
+                    file=file_name, tokens=', '.join(sorted(debug_tokens)))
             print(error_msg)
-
-        if files_with_debugging_enabled:
-            error_msg = ERROR_MSG + " Debug statements and/or print statements found: "
-            print(error_msg + "\n".join(files_with_debugging_enabled))
             sys.exit(1)
 
     def call_registered(self, name=None, *args, **kwargs):
@@ -162,10 +166,11 @@ class DesignCompliance(Compliance):
         return func(self, *args, **kwargs)
 
 
-def main():
-    """Main function to check if unsupported packages are imported in test files."""
-    sys.path.insert(0, "../../")
-    sys.path.insert(0, ".")
+def run():
+    """Check if unsupported packages are imported in the files given on the command line."""
+    # Absolute paths, since the daemon runs the checks of clients with different working directories.
+    sys.path.insert(0, os.path.abspath("../../"))
+    sys.path.insert(0, os.path.abspath("."))
 
     compliance = DesignCompliance()
     files_list = compliance.get_files_list("Check for any design compliance issues.")
@@ -174,5 +179,11 @@ def main():
         compliance.check(files_list=files_list)
 
 
+def main():
+    """Main function to check if unsupported packages are imported in test files."""
+    if not run_check_in_daemon('design_compliance'):
+        run()
+
+
 if __name__ == '__main__':
     main()
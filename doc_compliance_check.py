@@ -1,11 +1,13 @@
 """Utility to check documentation compliance."""
 
-import subprocess
 import sys
 
 from compliance_check import Compliance
-from helper_utils import execute_shell_command
-from config import (ERROR_MSG, OKAY_MSG)
+from compliance_daemon import run_check_in_daemon
+from helper_utils import parallel_map
+from config import (ERROR_MSG, OKAY_MSG, DOC_COMPLIANCE_BATCH_SIZE)
+
+# 'pydocstyle' is imported where it is used, so that handing the check over to the daemon does not pay for it.
 
 
 class DocCompliance(Compliance):
@@ -33,18 +35,19 @@ class DocCompliance(Compliance):
 
     def check(self, files_list):
         """
-        Check documentation compliance using 'pep257'.
+        Check documentation compliance using 'pydocstyle'.
 
         :param files_list: list
             List of files to check for documentation compliance.
         :return: None
         """
         if files_list:
-            commands = ['pep257']
-            commands.extend(files_list)
-            try:
-                execute_shell_command(command=commands)
-            except subprocess.CalledProcessError:
+            is_violation_found = False
+            for error in _get_errors(files_list):
+                print(error)
+                is_violation_found = True
+
+            if is_violation_found:
                 error_msg = "Found documentation compliance violations! " + ERROR_MSG
                 print(error_msg)
                 sys.exit(1)
@@ -52,15 +55,60 @@ class DocCompliance(Compliance):
                 print("All files have passed documentation compliance check. " + OKAY_MSG)
 
 
-def main():
-    """Main function."""
+def _get_errors(files_list):
+    """
+    Get the documentation compliance violations of the files.
+
+    A single batch of files is checked in-process, yielding the violations as 'pydocstyle' finds them.
+    Otherwise the batches are spread over worker processes, since the check is CPU bound.
+
+    :param files_list: list
+        List of files to check for documentation compliance.
+    :return: generator
+    """
+    if len(files_list) <= DOC_COMPLIANCE_BATCH_SIZE:
+        import pydocstyle
+
+        for error in pydocstyle.check(files_list):
+            yield str(error)
+        return
+
+    batches = [files_list[index:index + DOC_COMPLIANCE_BATCH_SIZE]
+               for index in range(0, len(files_list), DOC_COMPLIANCE_BATCH_SIZE)]
+    for batch_errors in parallel_map(_check_batch, batches):
+        for error in batch_errors:
+            yield error
+
+
+def _check_batch(files_batch):
+    """
+    Run 'pydocstyle' on a batch of files.
+
+    :param files_batch: list
+        List of files to check for documentation compliance.
+    :return: list
+        The documentation compliance violations found in the batch.
+    """
+    import pydocstyle
+
+    return [str(error) for error in pydocstyle.check(files_batch)]
+
+
+def run():
+    """Run the documentation compliance check on the files given on the command line."""
     compliance = DocCompliance()
-    files_list = compliance.get_files_list("Check documentation compliance using 'pep257'")
+    files_list = compliance.get_files_list("Check documentation compliance using 'pydocstyle'")
 
     if files_list:
         print("Checking documentation compliance on:\n {files}".format(files='\n '.join(files_list)))
         compliance.check(files_list=files_list)
 
 
+def main():
+    """Main function."""
+    if not run_check_in_daemon('doc_compliance'):
+        run()
+
+
 if __name__ == '__main__':
     main()
@@ -1,27 +1,53 @@
 """Module with various utility functions."""
 import ast
+import collections
 import datetime
+import functools
+import hashlib
 import importlib
+import logging
 import os
-import pytest
-import re
+import pickle
+import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from config import (
+    CACHE_DIR,
     COMPLIANCE_CHECK_PLUGINS_FOLDER,
     GIT_DIFF_FILTER,
+    NO_CACHE_ENV_VAR,
 )
 
+# The progress messages of the helpers, only formatted when debug logging is enabled.
+logger = logging.getLogger(__name__)
+
 
 class NotValidGitRepoException(Exception):
     """The not a valid Git repo exception class."""
 
 
+class ShellCommandException(subprocess.CalledProcessError):
+    """The failed shell command exception class, with the standard error of the command in its message."""
+
+    def __str__(self):
+        """Get the exception message, including the standard error of the command."""
+        message = super(ShellCommandException, self).__str__()
+        if self.stderr:
+            message += '\n' + self.stderr.decode('utf-8', errors='replace').strip()
+        return message
+
+
 def execute_shell_command(command, is_check_for_exit_code=True):
     """
     Execute an external shell command using subprocess module.
 
+    The standard error of the command is part of the raised exception when the exit status
+    is checked and not zero, otherwise it is discarded.
+
     :param command: list
         List containing the command to execute and its arguments.
     :param is_check_for_exit_code: boolean
@@ -30,14 +56,167 @@ def execute_shell_command(command, is_check_for_exit_code=True):
     :return: list
         Command output in list form.
     """
-    cmd = subprocess.run(command, stdout=subprocess.PIPE)
-    if is_check_for_exit_code:
-        cmd.check_returncode()
-    # Filter out the empty element and '\n' from the output.
-    cmd_output = list(filter(None, cmd.stdout.decode('utf-8').split('\n')))
+    # Closing the inherited file descriptors is skipped, which is safe as the descriptors opened by Python
+    # are non-inheritable (PEP 446); only descriptors made inheritable on purpose leak into the child.
+    cmd = subprocess.run(command,
+                         executable=_resolve_executable(command[0]),
+                         stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE,
+                         close_fds=False)
+    if is_check_for_exit_code and cmd.returncode:
+        raise ShellCommandException(cmd.returncode, command, cmd.stdout, cmd.stderr)
+    # Split the bytes and only decode the non-empty lines, instead of decoding and splitting the whole output.
+    cmd_output = [line.decode('utf-8') for line in cmd.stdout.splitlines() if line]
     return cmd_output
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_executable(name):
+    """
+    Get the full path of an executable, looking it up on the 'PATH' only once per process.
+
+    With a full path to the executable (and without closing the file descriptors), 'subprocess'
+    starts the command with 'posix_spawn' instead of 'fork' followed by 'exec'.
+
+    :param name: str
+        Name or path of the executable.
+    :return: str
+        Full path of the executable, or the name itself when it is not found.
+    """
+    return shutil.which(name) or name
+
+
+def parallel_map(func, items, chunksize=1, is_threaded=False):
+    """
+    Apply a function to every item, spreading the work across the available CPU cores.
+
+    A pool is not worth starting for a single item, so that case is run in-process.
+
+    :param func: function
+        Module level (picklable) function to apply to each item.
+    :param items: list
+        Items to process.
+    :param chunksize: int
+        Number of items handed to a worker process at a time.
+    :param is_threaded: boolean
+        Use threads instead of processes, for work which mostly waits on a subprocess.
+    :return: list
+        Results in the same order as the items.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    executor_class = ThreadPoolExecutor if is_threaded else ProcessPoolExecutor
+    with executor_class(max_workers=min(len(items), os.cpu_count() or 1)) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def get_cached_results(tool, version, files_list, compute_func, map_func=map):
+    """
+    Get the analysis results for files, re-using the results from earlier runs for unchanged files.
+
+    The results are pickled on disk, keyed by the SHA256 of the file contents, under a directory
+    per tool and tool version. Only the files missing from the cache are handed to 'compute_func'.
+    Set the 'COMPLIANCE_NO_CACHE' environment variable to bypass the cache.
+
+    :param tool: str
+        Name of the tool producing the results.
+    :param version: str
+        Version of the tool, so that results from other versions are not re-used.
+    :param files_list: list
+        List of files to get the results for.
+    :param compute_func: function
+        Module level function computing the result for a single file.
+    :param map_func: function
+        Function used to map 'compute_func' over the files missing from the cache, for e.g. 'parallel_map'.
+    :return: list
+        Results in the same order as the files.
+    """
+    is_cache_enabled = not os.getenv(NO_CACHE_ENV_VAR)
+    cache_dir = os.path.join(CACHE_DIR, '{tool}-{version}'.format(tool=tool, version=version))
+    results = [None] * len(files_list)
+    missed = []
+
+    for index, file_name in enumerate(files_list):
+        cache_file = None
+        if is_cache_enabled:
+            with open(file_name, 'rb') as fobj:
+                digest = hashlib.sha256(fobj.read()).hexdigest()
+            cache_file = os.path.join(cache_dir, digest + '.pkl')
+            try:
+                with open(cache_file, 'rb') as fobj:
+                    results[index] = pickle.load(fobj)
+                continue
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+        missed.append((index, file_name, cache_file))
+
+    # The same file given under different paths, for e.g. relative and absolute, is computed once.
+    files_to_compute = {}
+    for _, file_name, _ in missed:
+        files_to_compute.setdefault(os.path.realpath(file_name), file_name)
+    computed = dict(zip(files_to_compute, map_func(compute_func, list(files_to_compute.values()))))
+    for index, file_name, cache_file in missed:
+        results[index] = computed[os.path.realpath(file_name)]
+        if cache_file is not None:
+            _write_cache_file(cache_file, results[index])
+
+    if is_cache_enabled and files_list:
+        logger.debug("Analysis cache for '%s': %d hit(s), %d miss(es)",
+                     tool, len(files_list) - len(missed), len(missed))
+    return results
+
+
+def _write_cache_file(cache_file, result):
+    """
+    Atomically write a result to the on-disk cache.
+
+    Failing to write to the cache is not an error, the result is just computed again next time.
+
+    :param cache_file: str
+        Full path of the cache file.
+    :param result: object
+        The (picklable) result to store.
+    :return: None
+    """
+    cache_dir = os.path.dirname(cache_file)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                pickle.dump(result, fobj, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except Exception:
+            os.remove(temp_file)
+            raise
+    except (OSError, pickle.PicklingError):
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _get_git_repo_details():
+    """
+    Get whether inside a Git work tree, the base repository path and the current branch name.
+
+    All three are answered by a single 'git rev-parse' process instead of one process per query.
+    The result is cached for the lifetime of the process, see '_invalidate_git_cache'.
+
+    :param: None
+    :return: tuple
+        Tuple of the boolean, the base repository path and the current branch name.
+        The path and the branch name are 'None' when not inside a Git work tree.
+    """
+    details_cmd = ["git", "rev-parse", "--is-inside-work-tree", "--show-toplevel", "--abbrev-ref", "HEAD"]
+    # 'git rev-parse' stops at the first query which fails, so the output is parsed as far as it goes.
+    cmd_output = execute_shell_command(command=details_cmd, is_check_for_exit_code=False)
+    if not cmd_output or cmd_output[0] != 'true':
+        return False, None, None
+    cmd_output += [None] * (3 - len(cmd_output))
+    return True, cmd_output[1], cmd_output[2]
+
+
 def is_inside_git_repo_dir():
     """
     Check whether inside a Git repo directory.
@@ -45,10 +224,7 @@ def is_inside_git_repo_dir():
     :param: None
     :return: boolean
     """
-    check_cmd = ["git", "rev-parse", "--is-inside-work-tree"]
-    cmd_output = execute_shell_command(command=check_cmd)
-    cmd_output = ''.join(cmd_output)
-    return cmd_output == 'true'
+    return _get_git_repo_details()[0]
 
 
 def get_current_branch():
@@ -60,10 +236,8 @@ def get_current_branch():
         The current Git branch name.
     """
     if is_inside_git_repo_dir():
-        current_branch_cmd = ["git", "rev-parse", "--abbrev-ref", "HEAD"]
-        current_branch = execute_shell_command(command=current_branch_cmd)
-        current_branch = ''.join(current_branch)
-        print("Current Git branch is {branch}".format(branch=current_branch))
+        current_branch = _get_git_repo_details()[2]
+        logger.debug("Current Git branch is %s", current_branch)
         return current_branch
     else:
         raise NotValidGitRepoException("Not inside a valid Git repository.")
@@ -78,15 +252,22 @@ def get_repo_base_dir():
         Full path of the Git repository on disk.
     """
     if is_inside_git_repo_dir():
-        repo_base_path_cmd = ["git", "rev-parse", "--show-toplevel"]
-        repo_base_path = execute_shell_command(command=repo_base_path_cmd)
-        repo_base_path = ''.join(repo_base_path)
-        print("The Git base repository path is: {path}".format(path=repo_base_path))
+        repo_base_path = _get_git_repo_details()[1]
+        logger.debug("The Git base repository path is: %s", repo_base_path)
         return repo_base_path
     else:
         raise NotValidGitRepoException("Not inside a valid Git repository.")
 
 
+def _invalidate_git_cache():
+    """
+    Forget the cached Git repository details, for e.g. after changing to another directory.
+
+    :return: None
+    """
+    _get_git_repo_details.cache_clear()
+
+
 def get_files_to_be_committed():
     """
     Get the list of files to be committed.
@@ -103,7 +284,7 @@ def get_files_to_be_committed():
                                "--name-only",
                                "--cached"]
         files_to_commit = execute_shell_command(command=files_to_commit_cmd)
-        print("The total number of files to be committed is: {num}".format(num=len(files_to_commit)))
+        logger.debug("The total number of files to be committed is: %d", len(files_to_commit))
         return files_to_commit
     else:
         raise NotValidGitRepoException("Not inside a valid Git repository.")
@@ -120,31 +301,31 @@ def get_diff_between_branches(source_branch=None, target_branch=None):
     :return: list
         List of files differing between the branches.
     """
-    if is_inside_git_repo_dir():
-        if source_branch is None:
-            source_branch = "dev"
+    if source_branch is None:
+        source_branch = "dev"
+    # The explicit branch names are compared before running any Git command.
+    if source_branch != target_branch:
+        if not is_inside_git_repo_dir():
+            raise NotValidGitRepoException("Not inside a valid Git repository.")
         if target_branch is None:
             target_branch = get_current_branch()
 
-        # If both the source and target branches are the same, then do nothing, just return an empty list.
-        if source_branch == target_branch:
-            print("Both source and target branches are the same. Nothing to do, exiting ...")
-            return []
-
-        # Note the 3 dots, since we only want the changes from the target branch.
-        # https://stackoverflow.com/a/11163196
-        changed_files_cmd = ["git",
-                             "diff",
-                             source_branch + "..." + target_branch,
-                             "--diff-filter" + "=" + GIT_DIFF_FILTER,
-                             "--name-only"]
-        # Filter out the empty element and '\n' from the output.
-        change_list = execute_shell_command(command=changed_files_cmd)
-        print("The total number of files changed between branches '{src}' and '{tgt}' is: {num}".format(
-                src=source_branch, tgt=target_branch, num=len(change_list)))
-        return change_list
-    else:
-        raise NotValidGitRepoException("Not inside a valid Git repository.")
+    # If both the source and target branches are the same, then do nothing, just return an empty list.
+    if source_branch == target_branch:
+        logger.debug("Both source and target branches are the same. Nothing to do, exiting ...")
+        return []
+
+    # Note the 3 dots, since we only want the changes from the target branch.
+    # https://stackoverflow.com/a/11163196
+    changed_files_cmd = ["git",
+                         "diff",
+                         source_branch + "..." + target_branch,
+                         "--diff-filter" + "=" + GIT_DIFF_FILTER,
+                         "--name-only"]
+    change_list = execute_shell_command(command=changed_files_cmd)
+    logger.debug("The total number of files changed between branches '%s' and '%s' is: %d",
+                 source_branch, target_branch, len(change_list))
+    return change_list
 
 
 def get_file_modification_time(filename, is_human_readable=False, dt_format=None):
@@ -161,8 +342,13 @@ def get_file_modification_time(filename, is_human_readable=False, dt_format=None
     :param dt_format: str
         Format specifier (time or date) for the output. For e.g., "%m-%d-%Y"
     """
-    if os.path.isfile(filename):
-        timestamp = os.path.getmtime(filename)
+    # A single 'stat' call instead of one for 'os.path.isfile' and another one for 'os.path.getmtime'.
+    try:
+        file_stat = os.stat(filename)
+    except (OSError, ValueError):
+        file_stat = None
+    if file_stat is not None and stat.S_ISREG(file_stat.st_mode):
+        timestamp = file_stat.st_mtime
         if is_human_readable:
             return datetime.datetime.fromtimestamp(float(timestamp)).strftime(
                     dt_format if dt_format else "%d/%m/%Y")
@@ -182,8 +368,28 @@ def run_unit_tests_for_module(module_path):
     :return: int
         Exit code from 'pytest'.
     """
-    print("Executing unit tests for: {mod}".format(mod=module_path))
-    exit_code = pytest.main(['-qs', os.path.join(get_repo_base_dir(), module_path)])
+    return run_unit_tests_for_modules([module_path])
+
+
+def run_unit_tests_for_modules(module_paths):
+    """
+    Execute unit tests for the given modules in a single 'pytest' session.
+
+    Running all the modules at once pays for the 'pytest' start up, the plugin registration
+    and the collection only once, instead of once per module.
+
+    :param module_paths: list
+        Relative paths (relative to the base Git repo path) of the modules
+        for which unit tests need to be executed.
+    :return: int
+        Exit code from 'pytest'.
+    """
+    # Imported here, as importing 'pytest' takes most of the import time of this module.
+    import pytest
+
+    logger.debug("Executing unit tests for: %s", module_paths)
+    repo_base_dir = get_repo_base_dir()
+    exit_code = pytest.main(['-qs'] + [os.path.join(repo_base_dir, module_path) for module_path in module_paths])
     return exit_code
 
 
@@ -196,23 +402,57 @@ def filter_files(files_list):
     :return
         The filtered file list
     """
-    regexp = re.compile(r".*.py$")
-    python_files = [m.group(0) for m in map(regexp.match, files_list) if m is not None]
-    return python_files
+    # Several checks usually filter the same list of files, in the daemon across requests too,
+    # so the result is cached on the tuple of files. The filter only looks at the names, so it never goes stale.
+    return list(_filter_files(tuple(files_list)))
+
+
+@functools.lru_cache(maxsize=32)
+def _filter_files(files_tuple):
+    """
+    Filter files from the input tuple.
+
+    :param files_tuple: tuple
+        The files to be filtered.
+    :return: tuple
+        The filtered files.
+    """
+    return tuple(file_name for file_name in files_tuple if file_name.endswith('.py'))
 
 
 def parse_file(file_name):
     """
     Parse the given file using 'ast' to further usage.
 
+    The parsed tree is cached on the canonical path, the modification time and the size of the file,
+    so it is shared between the callers, whichever path they use for the file, and must not be modified.
+
     :param file_name: str
         The file which has to be parsed.
     :return: str
         Parsed file contents.
     """
-    with open(file_name, "r") as file:
-        file_contents = ast.parse(file.read(), filename=file_name)
-    return file_contents
+    file_stat = os.stat(file_name)
+    return _parse_file_cached(os.path.realpath(file_name), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_file_cached(file_name, mtime_ns, size):
+    """
+    Parse the given file, see 'parse_file'.
+
+    :param file_name: str
+        Canonical path of the file which has to be parsed.
+    :param mtime_ns: int
+        Modification time of the file in nanoseconds, part of the cache key only.
+    :param size: int
+        Size of the file in bytes, part of the cache key only.
+    :return: str
+        Parsed file contents.
+    """
+    # 'ast.parse' accepts the raw bytes and honours the encoding declaration of the file.
+    with open(file_name, "rb") as file:
+        return ast.parse(file.read(), filename=file_name)
 
 
 def get_program_details(file_name,
@@ -235,31 +475,131 @@ def get_program_details(file_name,
         Set this if return objects are required.
     :return: list
     """
-    file_contents = parse_file(file_name)
+    program_nodes = _classify_nodes(parse_file(file_name))
     if is_function_defs:
-        function_definitions = [item for item in ast.walk(file_contents) if isinstance(item, ast.FunctionDef)]
-        return function_definitions
+        return program_nodes['defs']
     if is_imports:
-        import_objects = set()
-        for node in ast.walk(file_contents):
-            if isinstance(node, ast.Import):
-                import_objects.update(alias.name for alias in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                import_objects.add(node.module)
-                for alias in node.names:
-                    module_name = '{}.{}'.format(node.module, alias.name)
-                    if module_name in sys.modules:
-                        import_objects.add(module_name)
-        return list(import_objects)
+        return list(_resolve_imports(program_nodes['imports'], program_nodes['candidates']))
     if is_function_calls:
-        call_objects = [item for item in ast.walk(file_contents) if isinstance(item, ast.Call)]
-        return call_objects
+        return program_nodes['calls']
     if is_return_types:
-        return_objects = [item for item in ast.walk(file_contents) if isinstance(item, ast.Return)]
-        return return_objects
+        return program_nodes['returns']
     return []
 
 
+def _classify_nodes(tree):
+    """
+    Classify the nodes of a parsed Python program in a single walk over its tree.
+
+    :param tree: object
+        The parsed program, see 'parse_file'.
+    :return: dict
+        Function definition, call and return objects, imported module names and the candidate
+        module names of the 'from ... import ...' statements, see '_resolve_imports'.
+    """
+    function_definitions, call_objects, return_objects, import_objects = [], [], [], set()
+    candidate_modules = set()
+    # The 'ast' node classes are not subclassed, so the node handler is looked up on the exact type.
+    node_handlers = {ast.FunctionDef: function_definitions.append,
+                     ast.Call: call_objects.append,
+                     ast.Return: return_objects.append}
+    for node in _walk_iter(tree):
+        node_type = type(node)
+        node_handler = node_handlers.get(node_type)
+        if node_handler is not None:
+            node_handler(node)
+        elif node_type is ast.Import:
+            import_objects.update(alias.name for alias in node.names)
+        elif node_type is ast.ImportFrom:
+            import_objects.add(node.module)
+            candidate_modules.update('{}.{}'.format(node.module, alias.name) for alias in node.names)
+    return {'defs': function_definitions,
+            'calls': call_objects,
+            'returns': return_objects,
+            'imports': import_objects,
+            'candidates': candidate_modules}
+
+
+def _resolve_imports(imported_modules, candidate_modules):
+    """
+    Get the imported module names, including the names imported with 'from ... import ...' which are modules.
+
+    Those names only count as modules when they are in 'sys.modules' of the current process,
+    which is why this is never part of a cached result.
+
+    :param imported_modules: set
+        The imported module names.
+    :param candidate_modules: set
+        The candidate module names of the 'from ... import ...' statements.
+    :return: frozenset
+    """
+    # The imported names which are modules, checked against 'sys.modules' all at once.
+    return frozenset(imported_modules) | (candidate_modules & sys.modules.keys())
+
+
+def _get_program_index(file_name):
+    """
+    Get the summary of a Python program file, see '_program_index'.
+
+    :param file_name: str
+        The Python program file to summarize.
+    :return: dict
+    """
+    file_stat = os.stat(file_name)
+    return _program_index(os.path.realpath(file_name), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@functools.lru_cache(maxsize=512)
+def _program_index(file_name, mtime_ns, size):
+    """
+    Get the summary of a Python program file, holding just the names and the line numbers.
+
+    Keeping only the projection, and not the 'ast' nodes which reference the whole tree,
+    makes the cached entry proportional to the number of symbols of the file instead of its size.
+    The summary is cached on the same key as the parsed tree, see 'parse_file', and is shared
+    between the callers, so it must not be modified.
+
+    :param file_name: str
+        Canonical path of the Python program file.
+    :param mtime_ns: int
+        Modification time of the file in nanoseconds, part of the cache key only.
+    :param size: int
+        Size of the file in bytes, part of the cache key only.
+    :return: dict
+        Function names, called function names, line numbers of the return statements,
+        imported module names and the candidate module names, see '_resolve_imports'.
+    """
+    program_nodes = _classify_nodes(parse_file(file_name))
+    return {'defs': tuple(func.name for func in program_nodes['defs']),
+            'calls': frozenset(call.func.id for call in program_nodes['calls'] if type(call.func) is ast.Name),
+            'returns': tuple(ret.lineno for ret in program_nodes['returns']),
+            'imports': frozenset(program_nodes['imports']),
+            'candidates': frozenset(program_nodes['candidates'])}
+
+
+def _walk_iter(node):
+    """
+    Recursively yield all the descendant nodes of a node, including the node itself, in the order of 'ast.walk'.
+
+    Like 'ast.walk', but reading the node fields directly instead of going through
+    the 'ast.iter_child_nodes' generator for every node.
+
+    :param node: object
+        The 'ast' node to start from.
+    :return: generator
+    """
+    todo = collections.deque([node])
+    while todo:
+        node = todo.popleft()
+        yield node
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, ast.AST):
+                todo.append(value)
+            elif isinstance(value, list):
+                todo.extend(item for item in value if isinstance(item, ast.AST))
+
+
 def get_function_names_from_file(file_name):
     """
     Get the names of functions from a given file.
@@ -269,11 +609,7 @@ def get_function_names_from_file(file_name):
     :return: list
         List containing function names.
     """
-    function_definitions = get_program_details(file_name=file_name, is_function_defs=True)
-    function_names_list = []
-    for func in function_definitions:
-        function_names_list.append(func.name)
-    return function_names_list
+    return list(_get_program_index(file_name)['defs'])
 
 
 def get_imported_modules_from_file(file_name):
@@ -284,7 +620,8 @@ def get_imported_modules_from_file(file_name):
         The Python program file from which to get the list of imported module names.
     :return: list
     """
-    return get_program_details(file_name=file_name, is_imports=True)
+    program_index = _get_program_index(file_name)
+    return list(_resolve_imports(program_index['imports'], program_index['candidates']))
 
 
 def get_function_calls_from_file(file_name):
@@ -295,12 +632,7 @@ def get_function_calls_from_file(file_name):
         The Python program file from which to get the list of function names which are called.
     :return: list
     """
-    call_objects = get_program_details(file_name=file_name, is_function_calls=True)
-    function_calls = set()
-    for calls in call_objects:
-        if isinstance(calls.func, ast.Name):
-            function_calls.add(calls.func.id)
-    return function_calls
+    return set(_get_program_index(file_name)['calls'])
 
 
 def get_function_returns_from_file(file_name):
@@ -322,6 +654,67 @@ def get_function_returns_from_file(file_name):
     return func_name_to_ret_type_obj_map
 
 
+def get_call_name(node):
+    """
+    Get the dotted name of the function being called, for e.g. 'pdb.set_trace'.
+
+    :param node: object
+        The 'func' node of an 'ast.Call' object.
+    :return: str
+        The dotted name, 'None' if the function is not a plain (dotted) name, for e.g. 'f()()'.
+    """
+    names = []
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    names.append(node.id)
+    return '.'.join(reversed(names))
+
+
+# Version of the results of 'scan_file', part of their on-disk cache key, to be bumped whenever they change.
+SCAN_FILE_VERSION = 2
+
+
+def scan_file(file_name):
+    """
+    Get the imports and the called functions of a file with a single parse and walk of its AST.
+
+    The result only depends on the contents of the file, so that it can be cached on disk,
+    see 'resolve_scanned_file' for the imported modules. Unlike 'get_function_calls_from_file',
+    the calls are recorded by their dotted name, for e.g. 'pdb.set_trace'.
+
+    :param file_name: str
+        The Python program file to scan.
+    :return: tuple
+        The frozenset of imported module names, the frozenset of the candidate module names
+        of the 'from ... import ...' statements and the frozenset of (dotted) names of the called functions.
+    """
+    program_nodes = _classify_nodes(parse_file(file_name))
+    function_calls = {get_call_name(call.func) for call in program_nodes['calls']}
+    function_calls.discard(None)
+    return (frozenset(program_nodes['imports']),
+            frozenset(program_nodes['candidates']),
+            frozenset(function_calls))
+
+
+def resolve_scanned_file(scanned_file):
+    """
+    Get the imported modules and the called functions from the result of 'scan_file'.
+
+    The names imported with 'from ... import ...' are resolved here, see '_resolve_imports',
+    and not in the cached result of 'scan_file'.
+
+    :param scanned_file: tuple
+        The result of 'scan_file'.
+    :return: tuple
+        The frozenset of imported module names and the frozenset of (dotted) names of the called functions.
+    """
+    imported_modules, candidate_modules, function_calls = scanned_file
+    return _resolve_imports(imported_modules, candidate_modules), function_calls
+
+
 def get_plugins(plugin_folder=None):
     """
     Get all the plugins from a folder.
@@ -334,13 +727,10 @@ def get_plugins(plugin_folder=None):
     if plugin_folder is None:
         plugin_folder = COMPLIANCE_CHECK_PLUGINS_FOLDER
     plugins_list = []
-    plugin_scripts = os.listdir(plugin_folder)
-    for script in plugin_scripts:
-        if script.startswith("check") and script.endswith(".py"):
-            script_path = plugin_folder + os.path.sep + script
-            module_name = '.'.join(script_path.split('/'))
-            plugin, extn = os.path.splitext(module_name)
-            plugins_list.append(plugin)
+    with os.scandir(plugin_folder) as entries:
+        for entry in entries:
+            if entry.name.startswith("check") and entry.name.endswith(".py") and entry.is_file():
+                plugins_list.append(entry.path[:-len(".py")].replace(os.path.sep, '.'))
     return plugins_list
 
 
@@ -0,0 +1,146 @@
+"""Unit tests for compliance_daemon."""
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+import pytest
+import compliance_daemon as daemon
+from mock import patch
+
+BAD_SOURCE = 'import os\n\n\ndef func():\n    return 1\n'
+
+
+def _get_request(tool, argv, **env):
+    """
+    Get a check request as sent by a client.
+
+    :param tool: str
+        Name of the compliance check.
+    :param argv: list
+        Command line arguments of the check.
+    :param env: dict
+        Environment variables set on top of the current ones.
+    :return: dict
+    """
+    return {'tool': tool,
+            'argv': argv,
+            'cwd': os.getcwd(),
+            'env': dict(os.environ, **env),
+            'fingerprint': daemon.get_fingerprint()}
+
+
+@pytest.mark.positive
+def test_get_fingerprint(tmpdir):
+    """
+    Unit test for 'get_fingerprint' not depending on the import path of the client.
+
+    :return: None
+    """
+    fingerprint = daemon.get_fingerprint()
+    with patch('sys.path', [str(tmpdir)] + sys.path):
+        assert (daemon.get_fingerprint() == fingerprint)
+
+
+@pytest.mark.positive
+def test_handle_request_failing_check(tmpdir):
+    """
+    Unit test for '_handle_request' with a check which finds violations.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write(BAD_SOURCE)
+    response = daemon._handle_request(_get_request('doc_compliance', ['-path', file_name]))
+    assert (response['exit_code'] == 1)
+    assert ('D100' in response['output'])
+
+
+@pytest.mark.positive
+def test_handle_request_exit_code():
+    """
+    Unit test for '_handle_request' passing on the code of a 'SystemExit'.
+
+    :return: None
+    """
+    response = daemon._handle_request(_get_request('code_complexity', ['-bogus']))
+    assert (response['exit_code'] == 2)
+    assert ('usage' in response['error'])
+
+
+@pytest.mark.positive
+def test_handle_request_flake8(tmpdir):
+    """
+    Unit test for '_handle_request' capturing the output which 'flake8' writes to 'sys.stdout.buffer'.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write(BAD_SOURCE)
+    response = daemon._handle_request(_get_request('code_compliance',
+                                                   ['-path', file_name, '--code_validators', 'flake8']))
+    assert (response['exit_code'] == 1)
+    assert ('F401' in response['output'])
+
+
+@pytest.mark.positive
+def test_handle_request_flake8_config(tmpdir):
+    """
+    Unit test for '_handle_request' using the 'flake8' configuration of the directory of each request.
+
+    :return: None
+    """
+    for dir_name in ('first', 'second'):
+        tmpdir.mkdir(dir_name).join('module.py').write(BAD_SOURCE)
+    tmpdir.join('second', 'setup.cfg').write('[flake8]\nextend-ignore = F401\n')
+    argv = ['-path', 'module.py', '--code_validators', 'flake8']
+    for dir_name, exit_code in (('first', 1), ('second', 0)):
+        request = _get_request('code_compliance', argv)
+        request['cwd'] = str(tmpdir.join(dir_name))
+        assert (daemon._handle_request(request)['exit_code'] == exit_code)
+
+
+@pytest.mark.positive
+def test_serve(tmpdir):
+    """
+    Unit test for a request and response round trip through 'serve', its handling of broken clients
+    and its restart on a changed client.
+
+    :return: None
+    """
+    socket_path = str(tmpdir.join('daemon.sock'))
+    with patch('compliance_daemon.CACHE_DIR', str(tmpdir)), \
+            patch('compliance_daemon.DAEMON_SOCKET_PATH', socket_path), \
+            patch('compliance_daemon.DAEMON_PID_FILE', str(tmpdir.join('daemon.pid'))), \
+            patch('compliance_daemon.DAEMON_REQUEST_TIMEOUT', 0.5), \
+            patch('helper_utils.CACHE_DIR', str(tmpdir.join('cache'))):
+        server = threading.Thread(target=daemon.serve, kwargs={'idle_timeout': 10})
+        server.start()
+        deadline = time.time() + 5
+        while not os.path.exists(socket_path) and time.time() < deadline:
+            time.sleep(0.05)
+        assert (stat.S_IMODE(os.stat(socket_path).st_mode) == 0o700)
+
+        # A client which stalls, sends a broken request or goes away does not take the daemon down.
+        stalled_client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stalled_client.connect(socket_path)
+        for data in (b'{"tool": ', b'[]', b''):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                client.sendall(data)
+
+        request = _get_request('code_complexity', ['-path', daemon.__file__], COMPLIANCE_NO_CACHE='1')
+        response = daemon._request_daemon(request)
+        assert (response['exit_code'] == 0)
+        assert ('No issues found' in response['output'])
+        assert (not tmpdir.join('cache').exists())
+        stalled_client.close()
+
+        request['fingerprint'] = 'changed'
+        assert (daemon._request_daemon(request) == {'restart': True})
+        server.join(timeout=10)
+        assert (not server.is_alive())
+        assert (not os.path.exists(socket_path))
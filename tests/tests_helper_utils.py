@@ -1,4 +1,8 @@
 """Unit tests for helper_utils."""
+import ast
+import os
+import subprocess
+import sys
 import pytest
 import helper_utils as helper
 from mock import patch
@@ -98,6 +102,17 @@ def test_filter_files():
     assert (len(helper.filter_files(files_list=files_list)) == 3)
 
 
+@pytest.mark.positive
+def test_filter_files_non_python_files():
+    """
+    Unit test for 'filter_files' dropping the files without a '.py' extension.
+
+    :return: None
+    """
+    files_list = ["config.py", "README.md", "fooXpy"]
+    assert (helper.filter_files(files_list=files_list) == ["config.py"])
+
+
 @pytest.mark.positive
 def test_get_program_details():
     """
@@ -128,6 +143,23 @@ def test_get_imported_modules_from_file():
     assert (len(helper.get_imported_modules_from_file(file_name=__file__)) > 0)
 
 
+@pytest.mark.positive
+def test_get_imported_modules_from_file_sys_modules(tmpdir):
+    """
+    Unit test for 'get_imported_modules_from_file' looking the imported names up in 'sys.modules' on every call.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write('from os import path\n')
+    assert ('os.path' in helper.get_imported_modules_from_file(file_name))
+    with patch.dict('sys.modules'):
+        del sys.modules['os.path']
+        assert ('os.path' not in helper.get_imported_modules_from_file(file_name))
+        assert ('os.path' not in helper.get_program_details(file_name, is_imports=True))
+
+
 @pytest.mark.positive
 def test_get_function_calls_from_file():
     """
@@ -136,3 +168,145 @@ def test_get_function_calls_from_file():
     :return: None
     """
     assert (len(helper.get_function_calls_from_file(file_name=__file__)) > 0)
+
+
+@pytest.mark.positive
+def test_parallel_map():
+    """
+    Unit test for 'parallel_map'.
+
+    :return: None
+    """
+    assert (helper.parallel_map(abs, [-1, -2, 3]) == [1, 2, 3])
+    assert (helper.parallel_map(abs, [-1, -2, 3], is_threaded=True) == [1, 2, 3])
+    assert (helper.parallel_map(abs, []) == [])
+
+
+@pytest.mark.positive
+def test_get_cached_results(tmpdir, caplog):
+    """
+    Unit test for 'get_cached_results'.
+
+    :param tmpdir: MANDATORY pytest fixture @n
+    :param caplog: MANDATORY pytest fixture @n
+    :return: None
+    """
+    computed_files = []
+
+    def compute_func(file_name):
+        computed_files.append(file_name)
+        return len(file_name)
+
+    with patch('helper_utils.CACHE_DIR', str(tmpdir)), caplog.at_level('DEBUG', logger='helper_utils'):
+        assert (helper.get_cached_results('test', '1', [__file__], compute_func) == [len(__file__)])
+        assert (helper.get_cached_results('test', '1', [__file__], compute_func) == [len(__file__)])
+    assert (computed_files == [__file__])
+    assert ("Analysis cache for 'test': 1 hit(s), 0 miss(es)" in caplog.messages)
+
+
+@pytest.mark.positive
+def test_get_cached_results_same_file(tmpdir):
+    """
+    Unit test for 'get_cached_results' computing a file given under different paths only once.
+
+    :param tmpdir: MANDATORY pytest fixture @n
+    :return: None
+    """
+    computed_files = []
+
+    def compute_func(file_name):
+        computed_files.append(file_name)
+        return file_name
+
+    files_list = [__file__, os.path.relpath(__file__)]
+    with patch('helper_utils.CACHE_DIR', str(tmpdir)):
+        assert (helper.get_cached_results('test', '1', files_list, compute_func) == [__file__, __file__])
+    assert (computed_files == [__file__])
+
+
+@pytest.mark.positive
+def test_scan_file():
+    """
+    Unit test for 'scan_file'.
+
+    :return: None
+    """
+    imported_modules, candidate_modules, function_calls = helper.scan_file(file_name=__file__)
+    assert ('pytest' in imported_modules)
+    assert ('mock.patch' in candidate_modules)
+    assert ('patch' in function_calls)
+    assert ('helper.scan_file' in function_calls)
+
+
+@pytest.mark.positive
+def test_resolve_scanned_file(tmpdir):
+    """
+    Unit test for 'resolve_scanned_file' looking the imported names up in 'sys.modules' of the current process.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write('from os import path\n')
+    scanned_file = helper.scan_file(file_name)
+    assert ('os.path' in helper.resolve_scanned_file(scanned_file)[0])
+    with patch.dict('sys.modules'):
+        del sys.modules['os.path']
+        assert ('os.path' not in helper.resolve_scanned_file(scanned_file)[0])
+
+
+@pytest.mark.positive
+def test_invalidate_git_cache():
+    """
+    Unit test for '_invalidate_git_cache'.
+
+    :return: None
+    """
+    assert (helper.is_inside_git_repo_dir())
+    assert (helper._get_git_repo_details.cache_info().currsize == 1)
+    helper._invalidate_git_cache()
+    assert (helper._get_git_repo_details.cache_info().currsize == 0)
+
+
+@pytest.mark.positive
+def test_parse_file(tmpdir):
+    """
+    Unit test for 'parse_file' re-using the parsed tree of an unchanged file.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write('x = 1\n')
+    tree = helper.parse_file(file_name)
+    assert (helper.parse_file(file_name) is tree)
+    with open(file_name, 'w') as fobj:
+        fobj.write('x = 1\ny = 2\n')
+    assert (len(helper.parse_file(file_name).body) == 2)
+
+
+@pytest.mark.positive
+def test_get_function_names_from_file_order(tmpdir):
+    """
+    Unit test for 'get_function_names_from_file' keeping the order of 'ast.walk'.
+
+    :return: None
+    """
+    file_name = str(tmpdir.join('module.py'))
+    with open(file_name, 'w') as fobj:
+        fobj.write('def f():\n    def inner():\n        pass\n\n\ndef g():\n    pass\n\n\ndef h():\n    pass\n')
+    assert (helper.get_function_names_from_file(file_name) == ['f', 'g', 'h', 'inner'])
+    tree = helper.parse_file(file_name)
+    assert (list(helper._walk_iter(tree)) == list(ast.walk(tree)))
+
+
+@pytest.mark.positive
+def test_execute_shell_command_error():
+    """
+    Unit test for 'execute_shell_command' reporting the standard error of a failed command.
+
+    :return: None
+    """
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        helper.execute_shell_command(command=["git", "rev-parse", "--verify", "no-such-branch"])
+    assert ('fatal' in str(exc_info.value))